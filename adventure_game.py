@@ -8,6 +8,7 @@ from game_engine import ENGINE, read_outcomes
 
 
 player_name = ""
+UNDO_COMMANDS = ("undo",)
 
 
 def get_player_name():
@@ -18,44 +19,70 @@ def get_player_name():
     print(f"\nWelcome, {player_name}!")
 
 
+def undo_move(session) -> bool:
+    before = session.current_scene_id
+    if session.undo():
+        if session.current_scene_id == before and session.current_scene().type == "input":
+            print("Your last guess is taken back.")
+        else:
+            print("You retrace your steps...")
+        return True
+    print("There is nothing to undo.")
+    return False
+
+
 def play_adventure():
     print("\nWelcome to the Kingdom's Peril Adventure!")
     session = ENGINE.new_session(player_name)
 
-    while True:
-        scene = session.current_scene()
-        print("\n" + session.render_text())
-
-        if scene.type == "choice":
-            # show options
-            for opt in scene.options:
-                print(f" - {opt.key}: {opt.label}")
-            print("   (type 'i' to view your inventory)")
-            sel = input("Choose: ").strip()
-            if sel.lower() in ("i", "inv", "inventory"):
-                print(f"Inventory: {session.describe_inventory()}")
-                continue
-            try:
-                message, is_fatal, is_end = session.apply_choice(sel)
-            except ValueError as e:
-                print(e)
-                continue
-        elif scene.type == "input":
-            ans = input("Enter your answer: ")
-            message, is_fatal, is_end = session.apply_input(ans)
-        else:
-            # end scenes (shouldn't be reached directly in this engine)
-            is_fatal, is_end, message = False, True, None
-
-        if message:
-            print(f"Note: {message}")
-
-        if is_end:
-            if is_fatal:
-                print("\nAlas, your quest has ended in tragedy!")
+    try:
+        while True:
+            scene = session.current_scene()
+            print("\n" + session.render_text())
+
+            if scene.type == "choice":
+                # show options
+                for opt in scene.options:
+                    print(f" - {opt.key}: {opt.label}")
+                print("   (type 'i' to view your inventory, 'undo' to take back your last move)")
+                sel = input("Choose: ").strip()
+                if sel.lower() in ("i", "inv", "inventory"):
+                    print(f"Inventory: {session.describe_inventory()}")
+                    continue
+                if sel.lower() in UNDO_COMMANDS:
+                    undo_move(session)
+                    continue
+                try:
+                    message, is_fatal, is_end = session.apply_choice(sel)
+                except ValueError as e:
+                    print(e)
+                    continue
+            elif scene.type == "input":
+                ans = input("Enter your answer (or 'undo'): ")
+                if ans.strip().lower() in UNDO_COMMANDS:
+                    undo_move(session)
+                    continue
+                message, is_fatal, is_end = session.apply_input(ans)
             else:
-                print("\nVictory! Your quest concludes gloriously.")
-            break
+                # end scenes (shouldn't be reached directly in this engine)
+                is_fatal, is_end, message = False, True, None
+
+            if message:
+                print(f"Note: {message}")
+
+            if is_end:
+                if is_fatal:
+                    print("\nAlas, your quest has ended in tragedy!")
+                    again = input("Type 'undo' to step back, or press Enter to accept your fate: ")
+                    if again.strip().lower() in UNDO_COMMANDS and undo_move(session):
+                        continue
+                else:
+                    print("\nVictory! Your quest concludes gloriously.")
+                break
+    finally:
+        # Log the path taken once the run is over, even on Ctrl-C/EOF
+        # (undone moves are left out)
+        session.finish()
 
 
 def main():
@@ -47,6 +47,8 @@ class AdventureGUI(tk.Tk):
         # Game state
         self.session = None
 
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Start the flow by asking for name
         self.ask_name()
 
@@ -64,6 +66,7 @@ class AdventureGUI(tk.Tk):
         self.show_main_menu()
 
     def show_main_menu(self):
+        self.finish_session()
         self.set_story(f"Welcome, {self.player_name}!\n\nChoose an option:")
         self.clear_buttons()
         self._crt_button(self.buttons_frame, "Start New Adventure", self.start_adventure).pack(side=tk.LEFT, padx=6)
@@ -98,6 +101,7 @@ class AdventureGUI(tk.Tk):
             row = tk.Frame(self.buttons_frame, bg="#000000")
             row.pack(fill=tk.X, padx=0, pady=(6, 0))
             self._crt_button(row, "Inventory", self.show_inventory).pack(side=tk.LEFT, padx=6)
+            self._undo_button(row).pack(side=tk.LEFT, padx=6)
             self._crt_button(row, "Back to Menu", self.show_main_menu).pack(side=tk.LEFT, padx=6)
         elif scene.type == "input":
             entry = tk.Entry(self.buttons_frame, bg="#000000", fg=self.phosphor, insertbackground=self.phosphor, relief=tk.FLAT)
@@ -106,6 +110,7 @@ class AdventureGUI(tk.Tk):
             row = tk.Frame(self.buttons_frame, bg="#000000")
             row.pack(fill=tk.X)
             self._crt_button(row, "Submit", lambda: self.handle_input(entry.get())).pack(side=tk.LEFT, padx=6)
+            self._undo_button(row).pack(side=tk.LEFT, padx=6)
             self._crt_button(row, "Back to Menu", self.show_main_menu).pack(side=tk.LEFT, padx=6)
         else:
             # end scenes not used directly; return to menu
@@ -117,7 +122,9 @@ class AdventureGUI(tk.Tk):
             messagebox.showinfo("Outcome", message)
         if is_end:
             if is_fatal:
-                messagebox.showinfo("Quest Ended", "Alas, your quest has ended in tragedy!")
+                if messagebox.askyesno("Quest Ended", "Alas, your quest has ended in tragedy!\n\nUndo your last move?"):
+                    self.undo_move()
+                    return
             else:
                 messagebox.showinfo("Victory", "Your quest concludes gloriously.")
             self.show_main_menu()
@@ -130,13 +137,34 @@ class AdventureGUI(tk.Tk):
             messagebox.showinfo("Outcome", message)
         if is_end:
             if is_fatal:
-                messagebox.showinfo("Quest Ended", "Alas, your quest has ended in tragedy!")
+                if messagebox.askyesno("Quest Ended", "Alas, your quest has ended in tragedy!\n\nUndo your last move?"):
+                    self.undo_move()
+                    return
             else:
                 messagebox.showinfo("Victory", "Your quest concludes gloriously.")
             self.show_main_menu()
             return
         self.render_scene()
 
+    def finish_session(self):
+        # Log the path taken once the run is over (undone moves are left out)
+        if self.session:
+            self.session.finish()
+            self.session = None
+
+    def on_close(self):
+        self.finish_session()
+        self.destroy()
+
+    def undo_move(self):
+        if not self.session:
+            return
+        before = self.session.current_scene_id
+        if self.session.undo():
+            if self.session.current_scene_id == before and self.session.current_scene().type == "input":
+                messagebox.showinfo("Undo", "Your last guess is taken back.")
+        self.render_scene()
+
     def show_inventory(self):
         if not self.session:
             return
@@ -159,6 +187,12 @@ class AdventureGUI(tk.Tk):
             highlightthickness=0,
         )
 
+    def _undo_button(self, parent):
+        btn = self._crt_button(parent, "Undo", self.undo_move)
+        if not self.session.can_undo():
+            btn.configure(state=tk.DISABLED, disabledforeground="#005522")
+        return btn
+
     def _on_resize(self, event):
         # Keep story text wrapping within available width, leaving some padding
         w = max(event.width - 40, 300)
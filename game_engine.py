@@ -8,8 +8,11 @@ or `apply_input` to advance.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Literal, Set
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Literal, Set
 import os
+import re
+import string
 
 
 OUTCOMES_FILE = os.path.join(os.path.dirname(__file__), "adventure_outcomes.txt")
@@ -30,6 +33,66 @@ def read_outcomes() -> str:
 
 SceneType = Literal["choice", "input", "end", "fatal"]
 
+# Words players wrap around an answer ("the letter m", "an echo")
+FILLER_WORDS = {"a", "an", "the", "letter", "word", "answer", "its", "it", "is"}
+# Answers shorter than this must match exactly (any letter is one typo from "m")
+FUZZY_MIN_LENGTH = 4
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_answer(value: str) -> str:
+    """Lowercase, drop punctuation and filler words: "The letter M." -> "m"."""
+    words = _NON_ALNUM.sub(" ", value.lower().replace("'", "")).split()
+    # Only strip a leading run of filler, and always keep the last word,
+    # so an answer that is itself a filler word ("the letter a") survives
+    start = 0
+    while start < len(words) - 1 and words[start] in FILLER_WORDS:
+        start += 1
+    return " ".join(words[start:])
+
+
+def _edits1(word: str) -> Set[str]:
+    letters = string.ascii_lowercase
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    deletes = {l + r[1:] for l, r in splits if r}
+    transposes = {l + r[1] + r[0] + r[2:] for l, r in splits if len(r) > 1}
+    replaces = {l + c + r[1:] for l, r in splits if r for c in letters}
+    inserts = {l + c + r for l, r in splits for c in letters}
+    return deletes | transposes | replaces | inserts
+
+
+class AnswerIndex:
+    """Lookup table from typed answers to `Scene.input_correct` keys.
+
+    Built once per input scene: holds every normalized answer plus its
+    edit-distance-1 neighbourhood, so matching an attempt is a single dict
+    lookup however many answers the scene accepts.
+    """
+
+    def __init__(self, answers: Iterable[str]):
+        self._exact: Dict[str, str] = {}
+        self._near: Dict[str, str] = {}
+        for key in answers:
+            self._exact.setdefault(normalize_answer(key), key)
+        ambiguous: Set[str] = set()
+        for norm, key in self._exact.items():
+            if len(norm) < FUZZY_MIN_LENGTH:
+                continue
+            for variant in _edits1(norm):
+                if variant in self._exact or variant in ambiguous:
+                    continue
+                other = self._near.setdefault(variant, key)
+                if other != key:
+                    # One typo away from two different answers: don't guess
+                    del self._near[variant]
+                    ambiguous.add(variant)
+
+    def lookup(self, value: str) -> Optional[str]:
+        """Return the matching `input_correct` key, or None."""
+        norm = normalize_answer(value)
+        exact = self._exact.get(norm)
+        return exact if exact is not None else self._near.get(norm)
+
 
 @dataclass
 class Option:
@@ -54,6 +117,8 @@ class Scene:
     # Optional retries for input scenes and progressive hints
     input_retries: int = 0
     input_hints: List[str] = field(default_factory=list)
+    # Built by the engine from `input_correct` when the scene is added
+    answer_index: Optional[AnswerIndex] = field(default=None, repr=False, compare=False)
 
 
 class Engine:
@@ -268,16 +333,153 @@ class Engine:
         ))
 
     def _add(self, scene: Scene) -> None:
+        if scene.type == "input":
+            scene.answer_index = AnswerIndex(scene.input_correct)
         self.scenes[scene.id] = scene
 
 
+@dataclass(frozen=True)
+class _Link:
+    """Immutable cons cell; tails are shared between every state that extends them."""
+    value: object
+    rest: Optional["_Link"] = None
+
+
+def _iter_links(link: Optional[_Link]):
+    while link is not None:
+        yield link.value
+        link = link.rest
+
+
+_NO_ATTEMPTS: Mapping[str, int] = MappingProxyType({})
+
+
+@dataclass(frozen=True, eq=False)
+class SessionState:
+    """One immutable point in a session's history.
+
+    Each move creates a new node that points at its parent and reuses the
+    parent's inventory chain and attempts mapping, so a history of N moves
+    costs O(N) memory no matter how much state the player carries.
+    """
+    scene_id: str
+    # Items gained, newest first
+    items: Optional[_Link] = None
+    # Riddle retries left per scene; shared with the parent unless changed
+    attempts: Mapping[str, int] = field(default_factory=lambda: _NO_ATTEMPTS)
+    # Outcome text of the move that produced this node
+    outcome: Optional[str] = None
+    parent: Optional["SessionState"] = field(default=None, repr=False)
+    depth: int = 0
+
+    def inventory(self) -> frozenset:
+        return frozenset(_iter_links(self.items))
+
+    def has_item(self, item: str) -> bool:
+        return any(v == item for v in _iter_links(self.items))
+
+    def advance(
+        self,
+        scene_id: Optional[str] = None,
+        item_gain: Optional[str] = None,
+        attempts: Optional[Tuple[str, Optional[int]]] = None,
+        outcome: Optional[str] = None,
+    ) -> "SessionState":
+        """Return a child node; only the changed parts are copied.
+
+        `attempts` is `(scene_id, left)`; `left=None` clears that scene.
+        """
+        items = self.items
+        if item_gain and not self.has_item(item_gain):
+            items = _Link(item_gain, items)
+        attempt_map = self.attempts
+        if attempts is not None:
+            sid, left = attempts
+            changed = dict(attempt_map)
+            if left is None:
+                changed.pop(sid, None)
+            else:
+                changed[sid] = left
+            attempt_map = MappingProxyType(changed) if changed else _NO_ATTEMPTS
+        return SessionState(
+            scene_id=scene_id if scene_id is not None else self.scene_id,
+            items=items,
+            attempts=attempt_map,
+            outcome=outcome,
+            parent=self,
+            depth=self.depth + 1,
+        )
+
+
 class Session:
-    def __init__(self, engine: Engine, player_name: str):
+    def __init__(self, engine: Engine, player_name: str, state: Optional[SessionState] = None):
         self.engine = engine
         self.name = player_name
-        self.inventory: Set[str] = set()
-        self.attempts_left: Dict[str, int] = {}
-        self.current_scene_id: str = engine.start_id
+        self.state: SessionState = state or SessionState(scene_id=engine.start_id)
+        # Newest node whose outcomes are already in the log
+        self._logged: Optional[SessionState] = None
+
+    # --- State views (read-only; change state via apply_* or SessionState.advance) ---
+    @property
+    def current_scene_id(self) -> str:
+        return self.state.scene_id
+
+    @property
+    def inventory(self) -> frozenset:
+        return self.state.inventory()
+
+    @property
+    def attempts_left(self) -> Mapping[str, int]:
+        return self.state.attempts
+
+    # --- History ---
+    def fork(self) -> "Session":
+        """Return an independent session sharing this one's history. O(1)."""
+        branch = Session(self.engine, self.name, self.state)
+        branch._logged = self._logged
+        return branch
+
+    def can_undo(self) -> bool:
+        return self.state.parent is not None
+
+    def undo(self) -> bool:
+        """Step back one move. Returns False if already at the start."""
+        return self.rewind(1) == 1
+
+    def rewind(self, n: int) -> int:
+        """Step back up to `n` moves; returns how many were undone."""
+        steps = max(0, min(n, self.state.depth))
+        state = self.state
+        for _ in range(steps):
+            state = state.parent
+        self.state = state
+        return steps
+
+    def finish(self) -> None:
+        """Write outcomes of the path actually taken to the outcomes log.
+
+        Outcomes are held on the history nodes until the run ends, so moves
+        the player undid never reach the log. Calling it again (after more
+        moves, a rewind, or on a fork) only writes nodes that are not on
+        the already-logged path.
+        """
+        # Only nodes below the deepest node shared with what was already
+        # logged are new; the walk stops there even after a rewind or fork.
+        logged = self._logged
+        pending: List[str] = []
+        node: Optional[SessionState] = self.state
+        while node is not None and node is not logged:
+            if logged is not None and logged.depth > node.depth:
+                logged = logged.parent
+                continue
+            if logged is not None and logged.depth == node.depth:
+                logged = logged.parent
+            if node.outcome:
+                pending.append(node.outcome)
+            node = node.parent
+        for text in reversed(pending):
+            save_outcome(text)
+        self._logged = self.state
 
     def current_scene(self) -> Scene:
         return self.engine.get_scene(self.current_scene_id)
@@ -287,7 +489,8 @@ class Session:
         return text.replace("{name}", self.name or "adventurer")
 
     def describe_inventory(self) -> str:
-        return ", ".join(sorted(self.inventory)) if self.inventory else "(empty)"
+        inventory = self.inventory
+        return ", ".join(sorted(inventory)) if inventory else "(empty)"
 
     def apply_choice(self, key: str) -> Tuple[Optional[str], bool, bool]:
         """Returns (message, is_fatal_end, is_end). Scene is advanced internally."""
@@ -295,49 +498,45 @@ class Session:
         key_low = key.strip().lower()
         for opt in scene.options:
             if opt.key.lower() == key_low:
-                if opt.outcome:
-                    save_outcome(opt.outcome)
-                if opt.item_gain:
-                    self.inventory.add(opt.item_gain)
-                if opt.fatal:
-                    # end game
-                    return (opt.outcome, True, True)
-                if opt.next_id is None:
-                    # successful end
-                    return (opt.outcome, False, True)
-                self.current_scene_id = opt.next_id
+                if opt.fatal or opt.next_id is None:
+                    # end game; still recorded so it can be undone
+                    self.state = self.state.advance(item_gain=opt.item_gain, outcome=opt.outcome)
+                    return (opt.outcome, opt.fatal, True)
+                self.state = self.state.advance(
+                    scene_id=opt.next_id, item_gain=opt.item_gain, outcome=opt.outcome
+                )
                 return (opt.outcome, False, False)
         raise ValueError(f"Invalid choice '{key}' for scene '{scene.id}'")
 
     def apply_input(self, value: str) -> Tuple[Optional[str], bool, bool]:
         """Returns (message, is_fatal_end, is_end). Scene is advanced internally."""
         scene = self.current_scene()
-        ans = value.strip().lower()
-        # correct answer
+        if scene.answer_index is not None:
+            ans = scene.answer_index.lookup(value)
+        else:
+            ans = value.strip().lower()
+        # correct answer (normalized, or within one typo of a longer answer)
         if ans in scene.input_correct:
             next_id, outcome = scene.input_correct[ans]
-            if outcome:
-                save_outcome(outcome)
-            self.current_scene_id = next_id
             # reset attempts tracking for this scene id (no longer in it)
-            self.attempts_left.pop(scene.id, None)
+            attempts = (scene.id, None) if scene.id in self.state.attempts else None
+            self.state = self.state.advance(scene_id=next_id, attempts=attempts, outcome=outcome)
             return (outcome, False, False)
 
         # wrong answer
         retries_cfg = scene.input_retries
         if retries_cfg > 0:
-            left = self.attempts_left.get(scene.id, retries_cfg)
-            left -= 1
-            self.attempts_left[scene.id] = left
+            left = self.state.attempts.get(scene.id, retries_cfg) - 1
             if left > 0:
+                self.state = self.state.advance(attempts=(scene.id, left))
                 # provide a hint if available based on attempt number used
                 used = retries_cfg - left
                 hint = scene.input_hints[used - 1] if used - 1 < len(scene.input_hints) else "Incorrect. Try again."
                 return (hint, False, False)
 
         # out of retries -> fatal
-        if scene.input_fatal_outcome:
-            save_outcome(scene.input_fatal_outcome)
+        attempts = (scene.id, 0) if retries_cfg > 0 else None
+        self.state = self.state.advance(attempts=attempts, outcome=scene.input_fatal_outcome)
         return (scene.input_fatal_outcome, True, True)
 
 